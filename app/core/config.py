@@ -1,37 +1,69 @@
 import os
+from dataclasses import dataclass, field
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file (local development convenience;
+# in deployments the variables are expected to be set in the environment)
 load_dotenv()
 
+
+def _env(name: str, default: str):
+    """Build a dataclass field that reads an environment variable once."""
+    return field(default_factory=lambda: os.getenv(name, default))
+
+
+def _env_int(name: str, default: str):
+    return field(default_factory=lambda: int(os.getenv(name, default)))
+
+
+def _env_float(name: str, default: str):
+    return field(default_factory=lambda: float(os.getenv(name, default)))
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Application configuration settings."""
-    
+
     # Server settings
-    MAX_WORKERS: int = int(os.getenv("MAX_WORKERS", "4"))
-    
+    MAX_WORKERS: int = _env_int("MAX_WORKERS", "4")
+    UVICORN_WORKERS: int = _env_int("UVICORN_WORKERS", os.getenv("WEB_CONCURRENCY", "1"))
+    MAX_CONCURRENT_JOBS: int = _env_int("MAX_CONCURRENT_JOBS", "4")
+
     # Video processing settings
-    MAX_FRAMES: int = int(os.getenv("MAX_FRAMES", "200"))
-    MAX_VIDEO_DURATION_SECONDS: int = int(os.getenv("MAX_VIDEO_DURATION_SECONDS", "300"))
-    FRAME_INTERVAL_SECONDS_DEFAULT: float = float(os.getenv("FRAME_INTERVAL_SECONDS_DEFAULT", "2.0"))
-    
+    MAX_FRAMES: int = _env_int("MAX_FRAMES", "200")
+    MAX_VIDEO_DURATION_SECONDS: int = _env_int("MAX_VIDEO_DURATION_SECONDS", "300")
+    FRAME_INTERVAL_SECONDS_DEFAULT: float = _env_float("FRAME_INTERVAL_SECONDS_DEFAULT", "2.0")
+
     # File handling
-    TMP_DIR: str = os.getenv("TMP_DIR", "/tmp/video_analyzer")
-    MAX_VIDEO_SIZE_MB: int = int(os.getenv("MAX_VIDEO_SIZE_MB", "500"))
-    
+    TMP_DIR: str = _env("TMP_DIR", "/tmp/video_analyzer")
+    MAX_VIDEO_SIZE_MB: int = _env_int("MAX_VIDEO_SIZE_MB", "500")
+
     # Timeout settings
-    DOWNLOAD_TIMEOUT_SECONDS: int = int(os.getenv("DOWNLOAD_TIMEOUT_SECONDS", "300"))
-    LLM_TIMEOUT_SECONDS: int = int(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
-    
+    DOWNLOAD_TIMEOUT_SECONDS: int = _env_int("DOWNLOAD_TIMEOUT_SECONDS", "300")
+    LLM_TIMEOUT_SECONDS: int = _env_int("LLM_TIMEOUT_SECONDS", "120")
+
+    # LLM batching
+    LLM_BATCH_CONCURRENCY: int = _env_int("LLM_BATCH_CONCURRENCY", "8")
+
+    # LLM response cache (0 disables caching)
+    LLM_CACHE_TTL_SECONDS: int = _env_int("LLM_CACHE_TTL_SECONDS", "3600")
+    LLM_CACHE_MAX_ENTRIES: int = _env_int("LLM_CACHE_MAX_ENTRIES", "128")
+
+    # Frame upload to an S3-compatible bucket (empty bucket sends frames inline)
+    FRAME_UPLOAD_BUCKET: str = _env("FRAME_UPLOAD_BUCKET", "")
+    FRAME_UPLOAD_PREFIX: str = _env("FRAME_UPLOAD_PREFIX", "frames/")
+    FRAME_UPLOAD_ENDPOINT_URL: str = _env("FRAME_UPLOAD_ENDPOINT_URL", "")
+    FRAME_URL_EXPIRY_SECONDS: int = _env_int("FRAME_URL_EXPIRY_SECONDS", "3600")
+
     # LangSmith settings
-    LANGCHAIN_TRACING_V2: str = os.getenv("LANGCHAIN_TRACING_V2", "true")
-    LANGCHAIN_PROJECT: str = os.getenv("LANGCHAIN_PROJECT", "video-analyzer")
-    LANGCHAIN_API_KEY: str = os.getenv("LANGCHAIN_API_KEY", "")
-    
+    LANGCHAIN_TRACING_V2: str = _env("LANGCHAIN_TRACING_V2", "true")
+    LANGCHAIN_PROJECT: str = _env("LANGCHAIN_PROJECT", "video-analyzer")
+    LANGCHAIN_API_KEY: str = _env("LANGCHAIN_API_KEY", "")
+
     # Azure OpenAI settings
-    AZURE_OPENAI_API_KEY: str = os.getenv("AZURE_OPENAI_API_KEY", "")
-    AZURE_OPENAI_ENDPOINT: str = os.getenv("AZURE_OPENAI_ENDPOINT", "")
-    OPENAI_API_VERSION: str = os.getenv("OPENAI_API_VERSION", "2024-12-01-preview")
-    AZURE_OPENAI_DEPLOYMENT_NAME: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
+    AZURE_OPENAI_API_KEY: str = _env("AZURE_OPENAI_API_KEY", "")
+    AZURE_OPENAI_ENDPOINT: str = _env("AZURE_OPENAI_ENDPOINT", "")
+    OPENAI_API_VERSION: str = _env("OPENAI_API_VERSION", "2024-12-01-preview")
+    AZURE_OPENAI_DEPLOYMENT_NAME: str = _env("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4o")
 
 settings = Settings()
@@ -1,5 +1,6 @@
 import os
 import logging
+from functools import lru_cache
 from langchain.chat_models import init_chat_model
 from langsmith import Client
 from .config import settings
@@ -7,52 +8,58 @@ from .config import settings
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# LangSmith monitoring setup
-os.environ["LANGCHAIN_TRACING_V2"] = settings.LANGCHAIN_TRACING_V2
-os.environ["LANGCHAIN_PROJECT"] = settings.LANGCHAIN_PROJECT
-os.environ["LANGCHAIN_API_KEY"] = settings.LANGCHAIN_API_KEY
+# LangSmith monitoring setup: the LangChain tracer only reads its configuration
+# from the environment, so export the settings defaults without overwriting
+# values that are already set
+for _name in ("LANGCHAIN_TRACING_V2", "LANGCHAIN_PROJECT", "LANGCHAIN_API_KEY"):
+    os.environ.setdefault(_name, getattr(settings, _name))
 
-# Azure OpenAI setup
-os.environ["AZURE_OPENAI_API_KEY"] = settings.AZURE_OPENAI_API_KEY
-os.environ["AZURE_OPENAI_ENDPOINT"] = settings.AZURE_OPENAI_ENDPOINT
-os.environ["OPENAI_API_VERSION"] = settings.OPENAI_API_VERSION
+# Azure OpenAI credentials (passed to the models directly)
+azure_credentials = {
+    "api_key": settings.AZURE_OPENAI_API_KEY,
+    "azure_endpoint": settings.AZURE_OPENAI_ENDPOINT,
+    "api_version": settings.OPENAI_API_VERSION,
+}
 
 # LangSmith client (optional direct usage)
 langsmith_client = None
 try:
     if settings.LANGCHAIN_API_KEY:
-        langsmith_client = Client()
+        langsmith_client = Client(api_key=settings.LANGCHAIN_API_KEY)
         logger.info("LangSmith client initialized successfully")
 except Exception as e:
-    logger.warning(f"Failed to initialize LangSmith client: {e}")
+    logger.warning("Failed to initialize LangSmith client: %s", e)
 
-# Initialize LLM models
-llm = None
-gpt_4o_mini = None
-
-try:
-    llm = init_chat_model(
-        "azure_openai:gpt-4o",
-        azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT_NAME,
-    )
-    logger.info("GPT-4o model initialized successfully")
-    
-    gpt_4o_mini = init_chat_model(
-        "azure_openai:gpt-4o-mini",
-        azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT_NAME,
-    )
-    logger.info("GPT-4o-mini model initialized successfully")
-    
-except Exception as e:
-    logger.error(f"Failed to initialize LLM models: {e}")
-    raise
+@lru_cache(maxsize=1)
+def get_llm():
+    """Get the GPT-4o model instance, creating it on first use."""
+    try:
+        model = init_chat_model(
+            "azure_openai:gpt-4o",
+            azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT_NAME,
+            **azure_credentials,
+        )
+        logger.info("GPT-4o model initialized successfully")
+        return model
+    except Exception as e:
+        logger.error("Failed to initialize GPT-4o model: %s", e)
+        raise RuntimeError(f"GPT-4o model not initialized: {e}")
 
 
+@lru_cache(maxsize=1)
 def get_gpt_4o_mini():
-    """Get the GPT-4o-mini model instance."""
-    if gpt_4o_mini is None:
-        raise RuntimeError("GPT-4o-mini model not initialized")
-    return gpt_4o_mini
+    """Get the GPT-4o-mini model instance, creating it on first use."""
+    try:
+        model = init_chat_model(
+            "azure_openai:gpt-4o-mini",
+            azure_deployment=settings.AZURE_OPENAI_DEPLOYMENT_NAME,
+            **azure_credentials,
+        )
+        logger.info("GPT-4o-mini model initialized successfully")
+        return model
+    except Exception as e:
+        logger.error("Failed to initialize GPT-4o-mini model: %s", e)
+        raise RuntimeError(f"GPT-4o-mini model not initialized: {e}")
 
 
 def invokeLLM(messages, name="Video Analysis"):
@@ -66,16 +73,15 @@ def invokeLLM(messages, name="Video Analysis"):
     Returns:
         LLM response
     """
-    if llm is None:
-        raise RuntimeError("GPT-4o model not initialized")
+    llm = get_llm()
     
     try:
         # LangSmith tracing is automatic with LANGCHAIN_TRACING_V2=true
         result = llm.invoke(messages, config={"run_name": name})
-        logger.info(f"LLM invocation successful: {name}")
+        logger.info("LLM invocation successful: %s", name)
         return result
     except Exception as e:
-        logger.error(f"LLM invocation failed for {name}: {e}")
+        logger.error("LLM invocation failed for %s: %s", name, e)
         raise
 
 
@@ -94,8 +100,102 @@ def invoke_mini_llm(messages, name="Video Analysis Mini"):
     
     try:
         result = mini_model.invoke(messages, config={"run_name": name})
-        logger.info(f"Mini LLM invocation successful: {name}")
+        logger.info("Mini LLM invocation successful: %s", name)
+        return result
+    except Exception as e:
+        logger.error("Mini LLM invocation failed for %s: %s", name, e)
+        raise
+
+
+def invokeLLM_batch(messages_list, name="Video Analysis Batch"):
+    """
+    Invoke GPT-4o on several independent prompts concurrently.
+    
+    Args:
+        messages_list: List of message lists, one per prompt
+        name: Run name for LangSmith tracing
+        
+    Returns:
+        List of LLM responses, in the same order as messages_list
+    """
+    llm = get_llm()
+    
+    try:
+        results = llm.batch(
+            messages_list,
+            config={"run_name": name, "max_concurrency": settings.LLM_BATCH_CONCURRENCY}
+        )
+        logger.info("LLM batch invocation successful: %s (%s prompts)", name, len(messages_list))
+        return results
+    except Exception as e:
+        logger.error("LLM batch invocation failed for %s: %s", name, e)
+        raise
+
+
+async def ainvokeLLM(messages, name="Video Analysis"):
+    """
+    Invoke GPT-4o asynchronously with LangSmith monitoring.
+    
+    Args:
+        messages: List of message dicts with 'role' and 'content' keys
+        name: Run name for LangSmith tracing
+        
+    Returns:
+        LLM response
+    """
+    llm = get_llm()
+    
+    try:
+        result = await llm.ainvoke(messages, config={"run_name": name})
+        logger.info("LLM invocation successful: %s", name)
+        return result
+    except Exception as e:
+        logger.error("LLM invocation failed for %s: %s", name, e)
+        raise
+
+
+async def ainvoke_mini_llm(messages, name="Video Analysis Mini"):
+    """
+    Invoke GPT-4o-mini asynchronously with LangSmith monitoring.
+    
+    Args:
+        messages: List of message dicts with 'role' and 'content' keys
+        name: Run name for LangSmith tracing
+        
+    Returns:
+        LLM response
+    """
+    mini_model = get_gpt_4o_mini()
+    
+    try:
+        result = await mini_model.ainvoke(messages, config={"run_name": name})
+        logger.info("Mini LLM invocation successful: %s", name)
         return result
     except Exception as e:
-        logger.error(f"Mini LLM invocation failed for {name}: {e}")
+        logger.error("Mini LLM invocation failed for %s: %s", name, e)
+        raise
+
+
+async def ainvokeLLM_batch(messages_list, name="Video Analysis Batch"):
+    """
+    Invoke GPT-4o on several independent prompts concurrently (async).
+    
+    Args:
+        messages_list: List of message lists, one per prompt
+        name: Run name for LangSmith tracing
+        
+    Returns:
+        List of LLM responses, in the same order as messages_list
+    """
+    llm = get_llm()
+    
+    try:
+        results = await llm.abatch(
+            messages_list,
+            config={"run_name": name, "max_concurrency": settings.LLM_BATCH_CONCURRENCY}
+        )
+        logger.info("LLM batch invocation successful: %s (%s prompts)", name, len(messages_list))
+        return results
+    except Exception as e:
+        logger.error("LLM batch invocation failed for %s: %s", name, e)
         raise
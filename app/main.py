@@ -1,13 +1,16 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
+from anyio import to_thread
 import uvicorn
 
 from .routers import analyze
 from .core.config import settings
-from .models.schemas import ErrorResponse
+from .services import callback
+from .utils import downloader
 
 # Configure logging
 logging.basicConfig(
@@ -16,9 +19,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global thread pool executor
-executor: ThreadPoolExecutor = None
-
 app = FastAPI(
     title="Video Analyzer API",
     description="Analyze videos from direct URLs using AI to extract scene and physics information",
@@ -40,20 +40,29 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup_event():
     """Initialize resources on startup."""
-    global executor
-    
     logger.info("Starting Video Analyzer API...")
     
-    # Initialize thread pool executor
-    executor = ThreadPoolExecutor(max_workers=settings.MAX_WORKERS)
-    logger.info(f"Thread pool initialized with {settings.MAX_WORKERS} workers")
+    # Initialize thread pool executor (one per worker process)
+    executor = ThreadPoolExecutor(max_workers=settings.MAX_WORKERS, thread_name_prefix="video-analyzer")
+    app.state.executor = executor
+    logger.info("Thread pool initialized with %s workers", settings.MAX_WORKERS)
+    
+    # Route run_in_executor(None, ...) calls to the bounded pool
+    asyncio.get_running_loop().set_default_executor(executor)
+    
+    # Bound the worker threads Starlette uses for sync endpoints and dependencies
+    to_thread.current_default_thread_limiter().total_tokens = settings.MAX_WORKERS
     
-    # Test LLM connection
+    # Initialize shared callback HTTP client and download session
+    callback.init_client()
+    downloader.init_session()
+    
+    # Configure LLM tracing; the models themselves are created on first use
     try:
-        from .core.llm_client import llm, gpt_4o_mini
-        logger.info("LLM clients initialized successfully")
+        from .core import llm_client
+        logger.info("LLM client module loaded")
     except Exception as e:
-        logger.error(f"Failed to initialize LLM clients: {e}")
+        logger.error("Failed to load LLM client module: %s", e)
         # Don't fail startup, but log the error
     
     logger.info("Video Analyzer API startup complete")
@@ -62,22 +71,25 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up resources on shutdown."""
-    global executor
-    
     logger.info("Shutting down Video Analyzer API...")
     
     # Shutdown thread pool
+    executor = getattr(app.state, "executor", None)
     if executor:
         executor.shutdown(wait=True)
         logger.info("Thread pool executor shutdown complete")
     
+    # Close shared callback HTTP client and download session
+    await callback.close_client()
+    await downloader.close_session()
+    
     logger.info("Video Analyzer API shutdown complete")
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler for unhandled errors."""
-    logger.error(f"Unhandled exception: {exc}", exc_info=True)
+    logger.error("Unhandled exception: %s", exc, exc_info=True)
     
     return JSONResponse(
         status_code=500,
@@ -103,9 +115,9 @@ async def root():
 app.include_router(analyze.router, tags=["Video Analysis"])
 
 
-def get_executor() -> ThreadPoolExecutor:
-    """Get the global thread pool executor."""
-    global executor
+def get_executor(request: Request) -> ThreadPoolExecutor:
+    """Get the worker's thread pool executor (usable as a FastAPI dependency)."""
+    executor = getattr(request.app.state, "executor", None)
     if executor is None:
         raise RuntimeError("Thread pool executor not initialized")
     return executor
@@ -116,6 +128,7 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,
+        workers=settings.UVICORN_WORKERS,
+        reload=settings.UVICORN_WORKERS == 1,  # Reload only works with a single process
         log_level="info"
     )
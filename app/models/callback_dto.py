@@ -1,9 +1,20 @@
-from typing_extensions import TypedDict
-from typing import Dict, Optional
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+from typing import Any, Dict, Literal
 
+CallbackMethod = Literal["POST", "GET", "PUT"]
 
-class CallbackDTO(TypedDict):
+
+def normalize_method(value: Any) -> Any:
+    """Upper-case an HTTP method before it is validated."""
+    return value.upper() if isinstance(value, str) else value
+
+
+class CallbackDTO(BaseModel):
     """Callback data transfer object for processing callbacks."""
-    url: str
-    method: str
-    headers: Dict[str, str]
\ No newline at end of file
+    model_config = ConfigDict(frozen=True)
+
+    url: HttpUrl
+    method: CallbackMethod
+    headers: Dict[str, str] = Field(default_factory=dict)
+
+    _normalize_method = field_validator("method", mode="before")(normalize_method)
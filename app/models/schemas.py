@@ -1,14 +1,16 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from .callback_dto import CallbackDTO
+from pydantic import BaseModel, ConfigDict, Field, HttpUrl, field_validator
+from typing import List, Optional, Dict
+from .callback_dto import CallbackDTO, CallbackMethod, normalize_method
 
 
 class CallbackPayload(BaseModel):
     """Callback configuration for post-processing notifications."""
-    url: str = Field(..., description="Callback URL to send the results to")
-    method: str = Field(default="POST", description="HTTP method (GET, POST, PUT)")
+    url: HttpUrl = Field(..., description="Callback URL to send the results to")
+    method: CallbackMethod = Field(default="POST", description="HTTP method (GET, POST, PUT)")
     headers: Optional[Dict[str, str]] = Field(default_factory=dict, description="Additional headers for the callback request")
     
+    _normalize_method = field_validator("method", mode="before")(normalize_method)
+    
     def to_dto(self) -> CallbackDTO:
         """Convert to CallbackDTO for processing."""
         return CallbackDTO(
@@ -20,7 +22,9 @@ class CallbackPayload(BaseModel):
 
 class AnalyzeRequest(BaseModel):
     """Request model for video analysis."""
-    videoUrl: str = Field(..., description="Direct video URL (mp4, avi, mkv, mov, webm, etc.)")
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    videoUrl: str = Field(..., min_length=1, description="Direct video URL (mp4, avi, mkv, mov, webm, etc.)")
     frame_interval_seconds: float = Field(default=2.0, gt=0, le=10, description="Interval between frame extractions")
     max_frames: int = Field(default=200, gt=0, le=500, description="Maximum number of frames to extract")
     callback_payload: Optional[List[CallbackPayload]] = Field(default_factory=list, description="List of callback configurations")
@@ -28,6 +32,8 @@ class AnalyzeRequest(BaseModel):
 
 class PhysicsObject(BaseModel):
     """Physics information for an object in a scene."""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
     name: str = Field(..., description="Name of the object")
     approx_velocity_m_s: Optional[float] = Field(None, description="Approximate velocity in m/s")
     direction: Optional[str] = Field(None, description="Direction of movement")
@@ -37,12 +43,16 @@ class PhysicsObject(BaseModel):
 
 class Physics(BaseModel):
     """Physics information for a scene."""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
     objects: List[PhysicsObject] = Field(default_factory=list, description="Objects in the scene")
     notes: Optional[str] = Field(None, description="General physics notes for the scene")
 
 
 class Scene(BaseModel):
     """A scene in the video with timing and physics information."""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
     start_time: float = Field(..., ge=0, description="Scene start time in seconds")
     end_time: float = Field(..., ge=0, description="Scene end time in seconds")
     summary: str = Field(..., description="Summary of what happens in the scene")
@@ -60,6 +70,12 @@ class AnalyzeResponse(BaseModel):
     fullNarrative: str = Field(..., description="Complete detailed frame analysis from LLM")
 
 
+class JobSubmittedResponse(BaseModel):
+    """Response model for an accepted asynchronous analysis job."""
+    status: str = Field(..., description="Job status")
+    message: str = Field(..., description="Job status details")
+
+
 class ErrorResponse(BaseModel):
     """Error response model."""
     error: str = Field(..., description="Error message")
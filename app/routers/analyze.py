@@ -1,13 +1,21 @@
-from fastapi import APIRouter, HTTPException, status, BackgroundTasks
-from starlette.concurrency import run_in_threadpool
+from fastapi import APIRouter, HTTPException, status
+import asyncio
 import logging
+from typing import Set, Union
 
-from ..models.schemas import AnalyzeRequest, AnalyzeResponse, HealthResponse
-from ..services.video_service import analyze_video, validate_videoUrl, get_processing_status
+from ..models.schemas import AnalyzeRequest, AnalyzeResponse, HealthResponse, JobSubmittedResponse
+from ..services.video_service import analyze_video, get_processing_status
+from ..core.config import settings
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Limit how many background analyses run at the same time
+_job_semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_JOBS)
+
+# Keep references to running jobs so they are not garbage collected
+_background_jobs: Set[asyncio.Task] = set()
+
 
 async def background_analyze_video(request: AnalyzeRequest):
     """
@@ -17,26 +25,31 @@ async def background_analyze_video(request: AnalyzeRequest):
         request: Video analysis request
     """
     try:
-        logger.info(f"Starting background video analysis for: {request.videoUrl}")
+        logger.info("Starting background video analysis for: %s", request.videoUrl)
         
         # Process video analysis
-        result = await analyze_video(request)
+        await analyze_video(request)
         
         logger.info("Background video analysis completed successfully")
         
     except Exception as e:
-        logger.error(f"Background video analysis failed: {e}")
+        logger.error("Background video analysis failed: %s", e)
         # Note: In a production system, you might want to send error callbacks here
 
 
-@router.post("/analyze")
-async def analyze_video_endpoint(request: AnalyzeRequest, background_tasks: BackgroundTasks, op_type: str = "async"):
+async def _run_job(request: AnalyzeRequest):
+    """Run a background analysis once a job slot is available."""
+    async with _job_semaphore:
+        await background_analyze_video(request)
+
+
+@router.post("/analyze", response_model=Union[AnalyzeResponse, JobSubmittedResponse])
+async def analyze_video_endpoint(request: AnalyzeRequest, op_type: str = "async"):
     """
     Analyze a video from URL and return structured scene and physics data.
     
     Args:
         request: Video analysis request
-        background_tasks: FastAPI background tasks
         op_type: Operation type - "sync" for immediate response, "async" for background processing
         
     Returns:
@@ -47,50 +60,31 @@ async def analyze_video_endpoint(request: AnalyzeRequest, background_tasks: Back
         HTTPException: Various error conditions
     """
     try:
-        # Validate request
-        if not request.videoUrl or not request.videoUrl.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Video URL is required"
-            )
-        
-        # if not validate_videoUrl(request.videoUrl):
-        #     raise HTTPException(
-        #         status_code=status.HTTP_400_BAD_REQUEST,
-        #         detail="Invalid video URL format. Please provide a direct video file URL."
-        #     )
-        
-        if request.frame_interval_seconds <= 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Frame interval must be positive"
-            )
-        
-        if request.max_frames <= 0 or request.max_frames > 500:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Max frames must be between 1 and 500"
-            )
-        
-        # For async processing, callbacks are required
+        # URL, frame interval and frame bounds are validated by AnalyzeRequest;
+        # for async processing, callbacks are also required
         if op_type == "async" and not request.callback_payload:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Callback payload is required for async processing"
             )
         
-        logger.info(f"Processing video analysis request ({op_type}): {request.videoUrl}")
+        logger.info("Processing video analysis request (%s): %s", op_type, request.videoUrl)
         
         if op_type == "sync":
             # Synchronous processing - return result immediately
-            result = await run_in_threadpool(analyze_video, request)
+            result = await analyze_video(request)
             logger.info("Synchronous video analysis completed successfully")
             return result
         else:
             # Asynchronous processing - submit background task
-            background_tasks.add_task(background_analyze_video, request)
+            job = asyncio.create_task(_run_job(request))
+            _background_jobs.add(job)
+            job.add_done_callback(_background_jobs.discard)
             logger.info("Video analysis job submitted for background processing")
-            return {"status": "job submitted", "message": "Video analysis started. Results will be sent to callback URLs."}
+            return JobSubmittedResponse(
+                status="job submitted",
+                message="Video analysis started. Results will be sent to callback URLs."
+            )
         
     except HTTPException:
         # Re-raise HTTP exceptions as-is
@@ -98,7 +92,7 @@ async def analyze_video_endpoint(request: AnalyzeRequest, background_tasks: Back
         
     except ValueError as e:
         # Handle validation errors (e.g., video too long, too large)
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
             detail=str(e)
@@ -106,7 +100,7 @@ async def analyze_video_endpoint(request: AnalyzeRequest, background_tasks: Back
         
     except Exception as e:
         # Handle unexpected errors
-        logger.error(f"Unexpected error during video analysis: {e}")
+        logger.error("Unexpected error during video analysis: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Video analysis failed: {str(e)}"
@@ -128,7 +122,7 @@ async def health_check() -> HealthResponse:
             version="1.0.0"
         )
     except Exception as e:
-        logger.error(f"Health check failed: {e}")
+        logger.error("Health check failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Service unhealthy"
@@ -146,7 +140,7 @@ async def get_status():
     try:
         return get_processing_status()
     except Exception as e:
-        logger.error(f"Status check failed: {e}")
+        logger.error("Status check failed: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get status"
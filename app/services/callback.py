@@ -1,117 +1,196 @@
+import asyncio
 import logging
-import requests
-from typing import List, Dict, Any
+import time
+import httpx
+from typing import List, Dict, Any, Optional
+from urllib.parse import urlsplit
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ..models.callback_dto import CallbackDTO
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP client for callbacks (created on application startup)
+_client: Optional[httpx.AsyncClient] = None
 
-def process_callbacks(callbacks: List[CallbackDTO], data: Dict[str, Any] = None):
+# Consecutive failures before a callback host is skipped, and for how long
+BREAKER_FAIL_MAX = 5
+BREAKER_RESET_TIMEOUT_SECONDS = 60
+
+
+class CircuitOpenError(Exception):
+    """Raised when a callback host is skipped after repeated failures."""
+
+
+class _CircuitBreaker:
+    """Per-host circuit breaker: opens after repeated failures, retries after a cool-down."""
+
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def is_open(self) -> bool:
+        return (
+            self.failures >= self.fail_max
+            and time.monotonic() - self.opened_at < self.reset_timeout
+        )
+
+    def record_success(self) -> None:
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.fail_max:
+            self.opened_at = time.monotonic()
+
+
+_breakers: Dict[str, _CircuitBreaker] = {}
+
+
+def _breaker_for(url: str) -> _CircuitBreaker:
+    """Get the circuit breaker for the host of a callback URL."""
+    host = urlsplit(url).netloc
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = _CircuitBreaker(BREAKER_FAIL_MAX, BREAKER_RESET_TIMEOUT_SECONDS)
+    return breaker
+
+
+def init_client() -> None:
+    """Create the shared callback HTTP client."""
+    global _client
+    if _client is None:
+        limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        _client = httpx.AsyncClient(
+            timeout=30,
+            limits=limits,
+            # HTTP/2 multiplexes concurrent callbacks to the same host over one connection
+            transport=httpx.AsyncHTTPTransport(http2=True, limits=limits)
+        )
+        logger.info("Callback HTTP client initialized")
+
+
+async def close_client() -> None:
+    """Close the shared callback HTTP client."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Callback HTTP client closed")
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared callback HTTP client."""
+    if _client is None:
+        raise RuntimeError("Callback HTTP client not initialized")
+    return _client
+
+
+async def process_callbacks(callbacks: List[CallbackDTO], data: Dict[str, Any] = None):
     """
-    Process multiple callbacks synchronously.
-    
+    Process multiple callbacks concurrently.
+
     Args:
         callbacks: List of callback configurations
         data: Analysis data to send to callbacks
-        
+
     Returns:
         List of callback results
     """
+    outcomes = await asyncio.gather(
+        *(process_callback(cb, data) for cb in callbacks),
+        return_exceptions=True
+    )
+
     results = []
-    for cb in callbacks:
-        try:
-            result = process_callback(cb, data)
-            results.append(result)
-        except Exception as e:
-            logger.error(f"Callback failed for {cb.get('url', 'unknown')}: {e}")
-            results.append({"error": str(e), "callback": cb})
+    for cb, outcome in zip(callbacks, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("Callback failed for %s: %s", cb.url, outcome)
+            results.append({"error": str(outcome), "callback": cb.model_dump(mode="json")})
+        else:
+            results.append(outcome)
     return results
 
 
-def process_callback(cb: CallbackDTO, data: Dict[str, Any] = None):
+async def process_callback(cb: CallbackDTO, data: Dict[str, Any] = None):
     """
     Process a single callback.
-    
+
     Args:
-        cb: Callback configuration dictionary
+        cb: Validated callback configuration
         data: Analysis data to send
-        
+
     Returns:
         Response from callback URL
     """
-    url = cb.get("url")
-    headers = cb.get("headers", {})
-    method = cb.get("method", "").upper()
+    url = str(cb.url)
 
-    logger.info(f"Processing callback: {method} {url}")
-    logger.debug(f"Headers: {headers}")
+    logger.info("Processing callback: %s %s", cb.method, url)
+    logger.debug("Headers: %s", cb.headers)
 
-    if method == "POST":
-        return do_post_request(url, headers, data)
-    elif method == "GET":
-        return do_get_request(url, headers)
-    elif method == "PUT":
-        return do_put_request(url, headers, data)
-    else:
-        raise ValueError(f"Unsupported HTTP method: {method}")
+    return await _DISPATCH[cb.method](url, cb.headers, data)
 
 
-def do_post_request(url: str, headers: Dict[str, str], data: Dict[str, Any]):
-    """Send POST request to callback URL."""
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=0.2, max=2),
+    retry=retry_if_exception_type((httpx.NetworkError, httpx.TimeoutException)),
+    reraise=True
+)
+async def _request_with_retry(method: str, url: str, headers: Dict[str, str], data: Dict[str, Any] = None):
+    """Send a request, retrying transient network errors and timeouts."""
+    return await get_client().request(method, url, headers=headers, json=data)
+
+
+async def _send_request(method: str, url: str, headers: Dict[str, str], data: Dict[str, Any] = None):
+    """Send a callback request and summarize the response."""
+    breaker = _breaker_for(url)
+    if breaker.is_open():
+        logger.warning("Skipping %s to %s: circuit open", method, url)
+        raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
     try:
-        logger.info(f"Sending POST to {url}")
-        response = requests.post(url, headers=headers, json=data, timeout=30)
-        logger.info(f"POST response status: {response.status_code}")
-        
+        logger.info("Sending %s to %s", method, url)
+        response = await _request_with_retry(method, url, headers, data)
+        breaker.record_success()
+        logger.info("%s response status: %s", method, response.status_code)
+
         return {
             "status": response.status_code,
             "url": url,
-            "method": "POST",
+            "method": method,
             "response": response.text,
             "success": response.status_code < 400
         }
-    except requests.exceptions.RequestException as e:
-        logger.error(f"POST request failed: {e}")
+    except httpx.HTTPError as e:
+        breaker.record_failure()
+        logger.error("%s request failed: %s", method, e)
         raise
 
 
-def do_get_request(url: str, headers: Dict[str, str]):
+async def do_post_request(url: str, headers: Dict[str, str], data: Dict[str, Any]):
+    """Send POST request to callback URL."""
+    return await _send_request("POST", url, headers, data)
+
+
+async def do_get_request(url: str, headers: Dict[str, str]):
     """Send GET request to callback URL."""
-    try:
-        logger.info(f"Sending GET to {url}")
-        response = requests.get(url, headers=headers, timeout=30)
-        logger.info(f"GET response status: {response.status_code}")
-        
-        return {
-            "status": response.status_code,
-            "url": url,
-            "method": "GET",
-            "response": response.text,
-            "success": response.status_code < 400
-        }
-    except requests.exceptions.RequestException as e:
-        logger.error(f"GET request failed: {e}")
-        raise
+    return await _send_request("GET", url, headers)
 
 
-def do_put_request(url: str, headers: Dict[str, str], data: Dict[str, Any]):
+async def do_put_request(url: str, headers: Dict[str, str], data: Dict[str, Any]):
     """Send PUT request to callback URL."""
-    try:
-        logger.info(f"Sending PUT to {url}")
-        logger.info(f"Headers: {headers}")
-        if data:
-            logger.info(f"Data: {data}")
-        response = requests.put(url, headers=headers, json=data, timeout=30)
-        logger.info(f"PUT response status: {response.status_code}")
-        
-        return {
-            "status": response.status_code,
-            "url": url,
-            "method": "PUT", 
-            "response": response.text,
-            "success": response.status_code < 400
-        }
-    except requests.exceptions.RequestException as e:
-        logger.error(f"PUT request failed: {e}")
-        raise
\ No newline at end of file
+    logger.debug("Headers: %s", headers)
+    if data and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Data: %s", data)
+    return await _send_request("PUT", url, headers, data)
+
+
+# Request handlers keyed by (already validated) callback method
+_DISPATCH = {
+    "POST": do_post_request,
+    "GET": lambda url, headers, _data: do_get_request(url, headers),
+    "PUT": do_put_request,
+}
@@ -1,15 +1,133 @@
+import re
 import json
+import time
+import asyncio
 import logging
-import base64
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
+import cv2
+import numpy as np
 
-from ..core.llm_client import invokeLLM, invoke_mini_llm
+try:
+    # SIMD-accelerated drop-in replacement for the stdlib base64 module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+try:
+    # Rust JSON parser; orjson.JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+try:
+    # SIMD tree hashing, several times faster than sha256 over frame-sized payloads
+    from blake3 import blake3 as content_hash
+except ImportError:
+    from hashlib import sha256 as content_hash
+
+from ..core.llm_client import ainvokeLLM, ainvoke_mini_llm
 from ..core.config import settings
 from ..utils.validator import validate_and_clean_scenes
+from ..utils import frame_store
 
 logger = logging.getLogger(__name__)
 
+JPEG_DATA_URL_PREFIX = b"data:image/jpeg;base64,"
+
+# JPEG quality used when an extracted frame is too large to send as-is
+REENCODE_JPEG_QUALITY = 75
+
+# System prompts (built once; only the user messages vary per request)
+FRAME_ANALYSIS_SYSTEM_PROMPT = """You are an expert video analyst. Analyze the provided video frames to create a detailed scene-by-scene analysis describing:
+- What objects/entities are present in each frame
+- Motion and behavior of objects between frames
+- Notable events (collisions, changes of direction, appearances/disappearances)
+- Rough timestamps where things occur
+- Physics observations (e.g., acceleration, speed estimates, forces, gravity effects, momentum transfers)
+
+Provide clear time-coded notes and keep the analysis factual and detailed. Focus on actual visual content you can observe."""
+
+STRUCTURED_SCENES_SCHEMA = """{
+  "scenes": [
+    {
+      "start_time": float,
+      "end_time": float,
+      "summary": string,
+      "physics": {
+        "objects": [
+          {
+            "name": string,
+            "approx_velocity_m_s": float | null,
+            "direction": string | null,
+            "collisions": boolean,
+            "notes": string | null
+          }
+        ],
+        "notes": string | null
+      }
+    }
+  ]
+}"""
+
+STRUCTURE_SYSTEM_PROMPT = f"""Convert the following analysis into strict JSON matching this schema:
+{STRUCTURED_SCENES_SCHEMA}
+
+Requirements:
+- Return ONLY valid JSON, no other text or markdown
+- Extract all scenes mentioned in the analysis
+- Use exact start_time and end_time values from the analysis
+- Include all objects and their physics properties
+- Convert velocity descriptions to numeric m/s values where possible
+- Set collisions to true only if explicitly mentioned"""
+
+# Markdown code fence wrapped around a JSON response
+_JSON_FENCE_RE = re.compile(r"^\s*```(?:json)?|```\s*$")
+
+# In-process LLM response cache: key -> (expiry time, response text)
+_response_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+
+
+def _cache_key(name: str, messages: List[Dict[str, Any]]) -> str:
+    """Hash the run name and full message content (prompts and frames) into a cache key."""
+    digest = content_hash(name.encode('utf-8'))
+    digest.update(json.dumps(messages, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+async def _get_cache_key(name: str, messages: List[Dict[str, Any]]) -> Optional[str]:
+    """Compute a cache key off the event loop, or None if caching is disabled."""
+    if settings.LLM_CACHE_TTL_SECONDS <= 0:
+        return None
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _cache_key, name, messages)
+
+
+def _cache_get(key: Optional[str]) -> Optional[str]:
+    """Get a cached LLM response if present and not expired."""
+    if key is None:
+        return None
+    entry = _response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if expires_at < time.monotonic():
+        _response_cache.pop(key, None)
+        return None
+    _response_cache.move_to_end(key)
+    return value
+
+
+def _cache_put(key: Optional[str], value: str) -> None:
+    """Cache an LLM response, evicting the least recently used entries."""
+    if key is None:
+        return
+    _response_cache[key] = (time.monotonic() + settings.LLM_CACHE_TTL_SECONDS, value)
+    _response_cache.move_to_end(key)
+    while len(_response_cache) > settings.LLM_CACHE_MAX_ENTRIES:
+        _response_cache.popitem(last=False)
+
 
 def create_frame_description(frame_path: str, timestamp: float) -> str:
     """
@@ -26,76 +144,95 @@ def create_frame_description(frame_path: str, timestamp: float) -> str:
     return f"Frame at {timestamp:.1f}s ({frame_name}): Frame extracted from video"
 
 
-def encode_frame_as_base64(frame_path: str, max_size_kb: int = 200) -> str:
+def encode_frame_as_base64(frame_data: bytes, max_size_kb: int = 200) -> str:
     """
     Encode frame as base64 string for LLM vision analysis.
     
     Args:
-        frame_path: Path to frame image
+        frame_data: JPEG-encoded frame
         max_size_kb: Maximum size in KB
         
     Returns:
         Base64 encoded string or empty string if too large
     """
     try:
-        file_size = Path(frame_path).stat().st_size
-        if file_size > max_size_kb * 1024:
-            logger.warning(f"Frame {frame_path} too large ({file_size/1024:.1f}KB > {max_size_kb}KB), skipping")
-            return ""  # Skip large files
-        
-        with open(frame_path, 'rb') as f:
-            encoded = base64.b64encode(f.read()).decode('utf-8')
-            return f"data:image/jpeg;base64,{encoded}"
+        size = len(frame_data)
+        frame_view = memoryview(frame_data)
+        
+        if size > max_size_kb * 1024:
+            # Re-encode at lower quality rather than dropping the frame
+            frame_view = reencode_jpeg(frame_view, REENCODE_JPEG_QUALITY)
+            if frame_view is None or frame_view.nbytes > max_size_kb * 1024:
+                logger.warning(f"Frame too large ({size/1024:.1f}KB > {max_size_kb}KB), skipping")
+                return ""  # Skip large files
+        
+        # Build the data URL in one bytearray so the payload is decoded to str only once
+        data_url = bytearray(JPEG_DATA_URL_PREFIX)
+        data_url += base64.b64encode(frame_view)
+        return data_url.decode('ascii')
     except Exception as e:
-        logger.warning(f"Failed to encode frame {frame_path}: {e}")
+        logger.warning(f"Failed to encode frame: {e}")
         return ""
 
 
-async def analyze_frames(frame_paths: List[str], timestamps: List[float]) -> str:
+def reencode_jpeg(frame_data, quality: int):
     """
-    Analyze video frames using LLM to generate detailed analysis.
+    Re-encode a JPEG image at the given quality.
     
     Args:
-        frame_paths: List of frame file paths
-        timestamps: List of frame timestamps
+        frame_data: Encoded JPEG bytes
+        quality: JPEG quality (0-100)
         
     Returns:
-        Detailed text analysis of the video
+        Memoryview over the re-encoded JPEG, or None if decoding/encoding fails
     """
-    logger.info(f"Analyzing {len(frame_paths)} frames with LLM")
+    image = cv2.imdecode(np.frombuffer(frame_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return None
     
-    # Create frame descriptions with base64 encoding for vision analysis
+    ok, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return memoryview(encoded) if ok else None
+
+
+async def _encode_frames(frames: List[bytes]) -> List[str]:
+    """Encode frames as data URLs concurrently on the default (bounded) thread pool."""
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(
+        loop.run_in_executor(None, encode_frame_as_base64, frame, 200)
+        for frame in frames
+    ))
+
+
+def _build_frame_messages(timestamps: List[float], image_urls: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build the frame analysis chat messages.
+    
+    Args:
+        timestamps: List of frame timestamps
+        image_urls: Image URL (data URL or remote URL) per frame; empty if unavailable
+        
+    Returns:
+        System and user messages
+    """
     frame_descriptions = []
     vision_content = []
     
-    for frame_path, timestamp in zip(frame_paths, timestamps):
-        # Try to encode frame as base64 for vision models
-        encoded_frame = encode_frame_as_base64(frame_path, max_size_kb=200)  # Increased size limit
-        
-        if encoded_frame:
+    for index, (timestamp, image_url) in enumerate(zip(timestamps, image_urls), start=1):
+        if image_url:
             # Add image to vision content
             vision_content.append({
                 "type": "image_url",
-                "image_url": {"url": encoded_frame}
+                "image_url": {"url": image_url}
             })
             frame_descriptions.append(f"Frame at {timestamp:.1f}s: [Image provided for visual analysis]")
         else:
-            frame_descriptions.append(f"Frame at {timestamp:.1f}s: Video frame extracted from {Path(frame_path).name}")
+            frame_descriptions.append(f"Frame at {timestamp:.1f}s: Video frame {index} extracted from video")
     
-    system_prompt = """You are an expert video analyst. Analyze the provided video frames to create a detailed scene-by-scene analysis describing:
-- What objects/entities are present in each frame
-- Motion and behavior of objects between frames
-- Notable events (collisions, changes of direction, appearances/disappearances)
-- Rough timestamps where things occur
-- Physics observations (e.g., acceleration, speed estimates, forces, gravity effects, momentum transfers)
-
-Provide clear time-coded notes and keep the analysis factual and detailed. Focus on actual visual content you can observe."""
-
     # Prepare user content - mix text and images if available
     user_content = [
         {
             "type": "text", 
-            "text": f"Analyze these {len(frame_paths)} video frames extracted at the following timestamps:\n\n" + 
+            "text": f"Analyze these {len(image_urls)} video frames extracted at the following timestamps:\n\n" + 
                    "\n".join(frame_descriptions) + 
                    "\n\nProvide a comprehensive scene-by-scene analysis with specific timestamps, object movements, and physics observations."
         }
@@ -104,12 +241,53 @@ Provide clear time-coded notes and keep the analysis factual and detailed. Focus
     # Add vision content if we have encoded frames
     user_content.extend(vision_content)
     
-    messages = [
-        {"role": "system", "content": system_prompt},
+    return [
+        {"role": "system", "content": FRAME_ANALYSIS_SYSTEM_PROMPT},
         {"role": "user", "content": user_content}
     ]
+
+
+async def analyze_frames(frames: List[bytes], timestamps: List[float]) -> str:
+    """
+    Analyze video frames using LLM to generate detailed analysis.
+    
+    Frames are sent inline as base64 data URLs, or, when an upload bucket is
+    configured, uploaded and passed to the LLM as presigned URLs.
+    
+    Args:
+        frames: List of JPEG-encoded frames
+        timestamps: List of frame timestamps
+        
+    Returns:
+        Detailed text analysis of the video
+    """
+    logger.info(f"Analyzing {len(frames)} frames with LLM")
+    
+    object_keys = None
+    if frame_store.is_enabled():
+        # Presigned URLs change on every upload, so the content-addressed
+        # object keys stand in for the images in the cache key
+        loop = asyncio.get_running_loop()
+        object_keys = await loop.run_in_executor(None, frame_store.frame_object_keys, frames)
+        messages = _build_frame_messages(timestamps, object_keys)
+    else:
+        messages = _build_frame_messages(timestamps, await _encode_frames(frames))
     
     try:
+        cache_key = await _get_cache_key("Video Frame Analysis", messages)
+        cached_text = _cache_get(cache_key)
+        if cached_text is not None:
+            logger.info("Frame analysis served from cache")
+            return cached_text
+        
+        if object_keys is not None:
+            try:
+                image_urls = await frame_store.upload_frames(frames, object_keys)
+            except Exception as e:
+                logger.warning(f"Frame upload failed, sending frames inline: {e}")
+                image_urls = await _encode_frames(frames)
+            messages = _build_frame_messages(timestamps, image_urls)
+        
         response = await _invoke_llm_async(messages, "Video Frame Analysis")
         analysis_text = response.content if hasattr(response, 'content') else str(response)
         logger.info(f"Frame analysis completed, length: {len(analysis_text)} characters")
@@ -117,6 +295,7 @@ Provide clear time-coded notes and keep the analysis factual and detailed. Focus
         if not analysis_text or len(analysis_text.strip()) < 50:
             raise Exception("LLM returned empty or very short analysis")
         
+        _cache_put(cache_key, analysis_text)
         return analysis_text
         
     except Exception as e:
@@ -137,39 +316,6 @@ async def structure_analysis(analysis_text: str, video_duration: float = 10.0) -
     """
     logger.info("Converting analysis to structured JSON")
     
-    schema = """{
-  "scenes": [
-    {
-      "start_time": float,
-      "end_time": float,
-      "summary": string,
-      "physics": {
-        "objects": [
-          {
-            "name": string,
-            "approx_velocity_m_s": float | null,
-            "direction": string | null,
-            "collisions": boolean,
-            "notes": string | null
-          }
-        ],
-        "notes": string | null
-      }
-    }
-  ]
-}"""
-
-    system_prompt = f"""Convert the following analysis into strict JSON matching this schema:
-{schema}
-
-Requirements:
-- Return ONLY valid JSON, no other text or markdown
-- Extract all scenes mentioned in the analysis
-- Use exact start_time and end_time values from the analysis
-- Include all objects and their physics properties
-- Convert velocity descriptions to numeric m/s values where possible
-- Set collisions to true only if explicitly mentioned"""
-
     user_prompt = f"""Convert this detailed video analysis to the required JSON format:
 
 {analysis_text}
@@ -177,32 +323,36 @@ Requirements:
 Extract all scenes with their exact timing and physics information."""
     
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": STRUCTURE_SYSTEM_PROMPT},
         {"role": "user", "content": user_prompt}
     ]
     
     try:
-        response = await _invoke_mini_llm_async(messages, "Analysis Structuring")
-        json_text = response.content if hasattr(response, 'content') else str(response)
-        
-        logger.info(f"Raw LLM JSON response length: {len(json_text)}")
-        
-        # Clean up JSON text (remove any markdown formatting)
-        json_text = json_text.strip()
-        if json_text.startswith('```json'):
-            json_text = json_text[7:]
-        if json_text.startswith('```'):
-            json_text = json_text[3:]
-        if json_text.endswith('```'):
-            json_text = json_text[:-3]
-        json_text = json_text.strip()
+        cache_key = await _get_cache_key("Analysis Structuring", messages)
+        json_text = _cache_get(cache_key)
+        from_cache = json_text is not None
+        if from_cache:
+            logger.info("Analysis structuring served from cache")
+        else:
+            response = await _invoke_mini_llm_async(messages, "Analysis Structuring")
+            json_text = response.content if hasattr(response, 'content') else str(response)
+            
+            logger.info(f"Raw LLM JSON response length: {len(json_text)}")
         
-        # Parse JSON
-        structured_data = json.loads(json_text)
+        # Parse JSON; compliant responses need no cleanup, so markdown
+        # fences are only stripped if the raw text does not parse
+        try:
+            structured_data = json_loads(json_text)
+        except json.JSONDecodeError:
+            json_text = _JSON_FENCE_RE.sub('', json_text).strip()
+            structured_data = json_loads(json_text)
         
         # Validate and clean the structure
         structured_data = validate_and_clean_scenes(structured_data, video_duration)
         
+        if not from_cache:
+            _cache_put(cache_key, json_text)
+        
         logger.info(f"Successfully structured analysis into {len(structured_data.get('scenes', []))} scenes")
         return structured_data
             
@@ -217,28 +367,16 @@ Extract all scenes with their exact timing and physics information."""
 
 
 async def _invoke_llm_async(messages: List[Dict[str, str]], name: str) -> Any:
-    """Async wrapper for LLM invocation."""
-    import asyncio
-    
-    def _invoke():
-        return invokeLLM(messages, name)
-    
-    loop = asyncio.get_running_loop()
+    """Invoke the LLM without blocking the event loop."""
     return await asyncio.wait_for(
-        loop.run_in_executor(None, _invoke),
+        ainvokeLLM(messages, name),
         timeout=settings.LLM_TIMEOUT_SECONDS
     )
 
 
 async def _invoke_mini_llm_async(messages: List[Dict[str, str]], name: str) -> Any:
-    """Async wrapper for mini LLM invocation."""
-    import asyncio
-    
-    def _invoke():
-        return invoke_mini_llm(messages, name)
-    
-    loop = asyncio.get_running_loop()
+    """Invoke the mini LLM without blocking the event loop."""
     return await asyncio.wait_for(
-        loop.run_in_executor(None, _invoke),
+        ainvoke_mini_llm(messages, name),
         timeout=settings.LLM_TIMEOUT_SECONDS
     )
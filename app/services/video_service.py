@@ -1,17 +1,35 @@
 import os
+import re
+import shutil
+import asyncio
 import tempfile
 import logging
 from typing import Dict, Any
+from urllib.parse import urlparse
 
 from ..models.schemas import AnalyzeRequest, AnalyzeResponse
-from ..utils.downloader import download_video, cleanup_file, cleanup_directory
-from ..utils.frames import extract_frames, cleanup_frames, get_frame_timestamps, get_video_duration
+from ..utils.downloader import download_video
+from ..utils.frames import extract_frames, get_frame_timestamps, get_video_duration
 from ..services.llm_service import analyze_frames, structure_analysis
 from ..services.callback import process_callbacks
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Common video file extension (at the end of the path) or 'video' anywhere in the URL
+_VIDEO_URL_RE = re.compile(r"\.(?:mp4|avi|mkv|mov|webm|flv|wmv)(?:$|[?#])|video", re.IGNORECASE)
+
+
+def _remove_scratch_dir(directory: str) -> None:
+    """Remove a request's scratch directory tree."""
+    try:
+        shutil.rmtree(directory)
+        logger.info(f"Cleaned up directory: {directory}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Cleanup error: {e}")
+
 
 async def analyze_video(request: AnalyzeRequest) -> AnalyzeResponse:
     """
@@ -28,35 +46,35 @@ async def analyze_video(request: AnalyzeRequest) -> AnalyzeResponse:
     # Create temporary directories
     temp_base_dir = tempfile.mkdtemp(prefix="video_analyzer_")
     video_dir = os.path.join(temp_base_dir, "video")
-    frames_dir = os.path.join(temp_base_dir, "frames")
-    
-    video_path = None
-    frame_paths = []
     
     try:
         # Step 1: Download video
         logger.info("Step 1: Downloading video")
         video_path = await download_video(request.videoUrl, video_dir)
         
+        # Probe the duration once (off the event loop);
+        # it is needed both to plan extraction and to clamp scene times
+        loop = asyncio.get_running_loop()
+        video_duration = await loop.run_in_executor(None, get_video_duration, video_path)
+        
         # Step 2: Extract frames
         logger.info("Step 2: Extracting frames")
-        frame_paths = await extract_frames(
+        frames = await extract_frames(
             video_path,
-            frames_dir,
             request.frame_interval_seconds,
-            request.max_frames
+            request.max_frames,
+            video_duration
         )
         
-        if not frame_paths:
+        if not frames:
             raise Exception("No frames could be extracted from the video")
         
-        # Calculate timestamps and get video duration
-        timestamps = get_frame_timestamps(frame_paths, request.frame_interval_seconds)
-        video_duration = get_video_duration(video_path)
+        # Calculate timestamps
+        timestamps = get_frame_timestamps(frames, request.frame_interval_seconds)
         
         # Step 3: Analyze frames with LLM
         logger.info("Step 3: Analyzing frames with LLM")
-        analysis_text = await analyze_frames(frame_paths, timestamps)
+        analysis_text = await analyze_frames(frames, timestamps)
         
         # Step 4: Structure analysis into JSON
         logger.info("Step 4: Converting to structured JSON")
@@ -76,7 +94,7 @@ async def analyze_video(request: AnalyzeRequest) -> AnalyzeResponse:
             try:
                 # Convert CallbackPayload objects to CallbackDTO
                 callback_dtos = [callback.to_dto() for callback in request.callback_payload]
-                process_callbacks(callback_dtos, response.model_dump())
+                await process_callbacks(callback_dtos, response.model_dump())
                 logger.info("Callbacks processed successfully")
             except Exception as callback_error:
                 logger.error(f"Callback processing failed: {callback_error}")
@@ -89,20 +107,10 @@ async def analyze_video(request: AnalyzeRequest) -> AnalyzeResponse:
         raise
         
     finally:
-        # Cleanup resources
+        # Remove the scratch directory (video included) in the executor,
+        # off the response path; shutdown waits for pending removals
         logger.info("Cleaning up temporary files")
-        try:
-            if video_path:
-                cleanup_file(video_path)
-            if frame_paths:
-                cleanup_frames(frame_paths)
-            cleanup_directory(temp_base_dir)
-            
-            # Remove temp base directory
-            if os.path.exists(temp_base_dir):
-                os.rmdir(temp_base_dir)
-        except Exception as cleanup_error:
-            logger.warning(f"Cleanup error: {cleanup_error}")
+        asyncio.get_running_loop().run_in_executor(None, _remove_scratch_dir, temp_base_dir)
 
 
 def validate_videoUrl(url: str) -> bool:
@@ -116,26 +124,18 @@ def validate_videoUrl(url: str) -> bool:
         True if URL appears valid
     """
     try:
-        from urllib.parse import urlparse
         parsed = urlparse(url)
         
         # Check if URL has scheme and netloc
         if not parsed.scheme or not parsed.netloc:
             return False
         
-        # Only allow http/https schemes
-        if parsed.scheme.lower() not in ['http', 'https']:
+        # Only allow http/https schemes (urlparse lower-cases the scheme)
+        if parsed.scheme not in ('http', 'https'):
             return False
         
-        # Check for common video file extensions in direct URLs
-        video_extensions = ['.mp4', '.avi', '.mkv', '.mov', '.webm', '.flv', '.wmv']
-        path_lower = parsed.path.lower()
-        
         # Allow URLs with video extensions or containing 'video' in path/query
-        has_video_ext = any(path_lower.endswith(ext) for ext in video_extensions)
-        has_video_in_path = 'video' in url.lower()
-        
-        return has_video_ext or has_video_in_path
+        return _VIDEO_URL_RE.search(url) is not None
         
     except Exception:
         return False
@@ -3,12 +3,47 @@ import asyncio
 import aiohttp
 import aiofiles
 import logging
+from typing import Optional
 from urllib.parse import urlparse
 
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Read/write the video in 1 MiB chunks to keep event loop and file I/O round-trips low
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+# Shared HTTP session for downloads (created on application startup)
+_session: Optional[aiohttp.ClientSession] = None
+
+
+def init_session() -> None:
+    """Create the shared download HTTP session."""
+    global _session
+    if _session is None:
+        _session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=settings.DOWNLOAD_TIMEOUT_SECONDS),
+            # Reuse keep-alive connections and cached DNS lookups for repeat hosts
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=600)
+        )
+        logger.info("Download HTTP session initialized")
+
+
+async def close_session() -> None:
+    """Close the shared download HTTP session."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
+        logger.info("Download HTTP session closed")
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the shared download HTTP session."""
+    if _session is None:
+        raise RuntimeError("Download HTTP session not initialized")
+    return _session
+
 
 async def download_video(url: str, output_dir: str) -> str:
     """
@@ -45,42 +80,41 @@ async def download_video(url: str, output_dir: str) -> str:
     filepath = os.path.join(output_dir, filename)
     
     try:
-        timeout = aiohttp.ClientTimeout(total=settings.DOWNLOAD_TIMEOUT_SECONDS)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                
-                # Check content type
-                content_type = response.headers.get('Content-Type', '').lower()
-                if content_type and not any(vid_type in content_type for vid_type in ['video', 'octet-stream', 'mp4', 'avi', 'mov']):
-                    logger.warning(f"Content-Type may not be video: {content_type}")
-                
-                # Check content length
-                content_length = response.headers.get('Content-Length')
-                if content_length:
-                    size_mb = int(content_length) / (1024 * 1024)
-                    if size_mb > settings.MAX_VIDEO_SIZE_MB:
-                        raise ValueError(f"Video too large: {size_mb:.1f}MB > {settings.MAX_VIDEO_SIZE_MB}MB")
-                    logger.info(f"Downloading video: {size_mb:.1f}MB")
-                
-                # Download file
-                async with aiofiles.open(filepath, 'wb') as f:
-                    downloaded_size = 0
-                    async for chunk in response.content.iter_chunked(8192):
-                        await f.write(chunk)
-                        downloaded_size += len(chunk)
-                        
-                        # Check size during download
-                        if downloaded_size > settings.MAX_VIDEO_SIZE_MB * 1024 * 1024:
-                            raise ValueError(f"Video exceeded size limit during download: {downloaded_size / (1024*1024):.1f}MB")
-                
-                # Verify file was created and has content
-                if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
-                    raise Exception("Downloaded file is empty or was not created")
-                
-                logger.info(f"Video downloaded successfully: {filepath} ({downloaded_size / (1024*1024):.1f}MB)")
-                return filepath
-                
+        session = get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            
+            # Check content type
+            content_type = response.headers.get('Content-Type', '').lower()
+            if content_type and not any(vid_type in content_type for vid_type in ['video', 'octet-stream', 'mp4', 'avi', 'mov']):
+                logger.warning(f"Content-Type may not be video: {content_type}")
+            
+            # Check content length
+            content_length = response.headers.get('Content-Length')
+            if content_length:
+                size_mb = int(content_length) / (1024 * 1024)
+                if size_mb > settings.MAX_VIDEO_SIZE_MB:
+                    raise ValueError(f"Video too large: {size_mb:.1f}MB > {settings.MAX_VIDEO_SIZE_MB}MB")
+                logger.info(f"Downloading video: {size_mb:.1f}MB")
+            
+            # Download file
+            async with aiofiles.open(filepath, 'wb') as f:
+                downloaded_size = 0
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await f.write(chunk)
+                    downloaded_size += len(chunk)
+                    
+                    # Check size during download
+                    if downloaded_size > settings.MAX_VIDEO_SIZE_MB * 1024 * 1024:
+                        raise ValueError(f"Video exceeded size limit during download: {downloaded_size / (1024*1024):.1f}MB")
+            
+            # Verify file was created and has content
+            if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
+                raise Exception("Downloaded file is empty or was not created")
+            
+            logger.info(f"Video downloaded successfully: {filepath} ({downloaded_size / (1024*1024):.1f}MB)")
+            return filepath
+            
     except aiohttp.ClientError as e:
         # Clean up partial download
         if os.path.exists(filepath):
@@ -114,11 +148,13 @@ def cleanup_file(filepath: str) -> None:
 def cleanup_directory(directory: str) -> None:
     """Safely remove all files in a directory."""
     try:
-        if os.path.exists(directory):
-            for filename in os.listdir(directory):
-                filepath = os.path.join(directory, filename)
-                if os.path.isfile(filepath):
-                    os.remove(filepath)
-            logger.info(f"Cleaned up directory: {directory}")
+        # scandir entries carry their file type, so no extra stat per file
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    os.unlink(entry.path)
+        logger.info(f"Cleaned up directory: {directory}")
+    except FileNotFoundError:
+        pass
     except Exception as e:
         logger.warning(f"Failed to cleanup directory {directory}: {e}")
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+from typing import List, Optional
+
+try:
+    import aioboto3
+except ImportError:
+    aioboto3 = None
+
+try:
+    from blake3 import blake3 as content_hash
+except ImportError:
+    from hashlib import sha256 as content_hash
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Shared aioboto3 session (holds credentials/config; clients are opened per upload batch)
+_session: Optional["aioboto3.Session"] = None
+
+if settings.FRAME_UPLOAD_BUCKET and aioboto3 is None:
+    logger.warning("FRAME_UPLOAD_BUCKET is set but aioboto3 is not installed; frames will be sent inline")
+
+
+def is_enabled() -> bool:
+    """Whether frames are uploaded to the object store instead of sent inline."""
+    return bool(settings.FRAME_UPLOAD_BUCKET) and aioboto3 is not None
+
+
+def frame_object_keys(frames: List[bytes]) -> List[str]:
+    """
+    Build content-addressed object keys (blake3 or sha256 of the JPEG) for frames.
+
+    Identical frames map to the same key, so keys also identify the frames
+    for response caching before anything is uploaded.
+
+    Args:
+        frames: List of JPEG-encoded frames
+
+    Returns:
+        List of object keys
+    """
+    prefix = settings.FRAME_UPLOAD_PREFIX
+    return [f"{prefix}{content_hash(frame).hexdigest()}.jpg" for frame in frames]
+
+
+def _get_session() -> "aioboto3.Session":
+    global _session
+    if _session is None:
+        _session = aioboto3.Session()
+    return _session
+
+
+async def upload_frames(frames: List[bytes], object_keys: List[str]) -> List[str]:
+    """
+    Upload frames to the object store concurrently and presign them for reading.
+
+    Args:
+        frames: List of JPEG-encoded frames
+        object_keys: Object key for each frame (see frame_object_keys)
+
+    Returns:
+        List of presigned GET URLs, in frame order
+    """
+    bucket = settings.FRAME_UPLOAD_BUCKET
+    endpoint_url = settings.FRAME_UPLOAD_ENDPOINT_URL or None
+
+    async with _get_session().client("s3", endpoint_url=endpoint_url) as s3:
+        async def _upload(frame: bytes, key: str) -> str:
+            await s3.put_object(Bucket=bucket, Key=key, Body=frame, ContentType="image/jpeg")
+            return await s3.generate_presigned_url(
+                "get_object",
+                Params={"Bucket": bucket, "Key": key},
+                ExpiresIn=settings.FRAME_URL_EXPIRY_SECONDS
+            )
+
+        urls = await asyncio.gather(*(_upload(frame, key) for frame, key in zip(frames, object_keys)))
+
+    logger.info("Uploaded %d frames to bucket %s", len(urls), bucket)
+    return urls
@@ -3,16 +3,48 @@ import asyncio
 import subprocess
 import logging
 import cv2
-from typing import List
+from typing import List, Optional
+
+try:
+    # PyAV reads container metadata in-process (no ffprobe fork/exec)
+    import av
+except ImportError:
+    av = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# JPEG start/end of image markers
+JPEG_SOI = b'\xff\xd8'
+JPEG_EOI = b'\xff\xd9'
+
+# Frames are sent to the LLM, so cap their height and JPEG quality to keep
+# the request payload small (ffmpeg -q:v is 2-31, lower is better)
+FRAME_MAX_HEIGHT = 720
+FFMPEG_JPEG_QSCALE = 5
+OPENCV_JPEG_QUALITY = 75
+
+
+def _get_duration_pyav(video_path: str) -> float:
+    """Read the video duration from container metadata with PyAV."""
+    with av.open(video_path) as container:
+        stream = container.streams.video[0] if container.streams.video else None
+        if stream is not None and stream.duration:
+            return float(stream.duration * stream.time_base)
+        if container.duration:
+            return container.duration / av.time_base
+    raise ValueError("Duration not available in container metadata")
+
 
 def get_video_duration(video_path: str) -> float:
     """
-    Get video duration using ffprobe.
+    Get video duration using PyAV, falling back to ffprobe.
     
     Args:
         video_path: Path to video file
@@ -20,6 +52,14 @@ def get_video_duration(video_path: str) -> float:
     Returns:
         Duration in seconds
     """
+    if av is not None:
+        try:
+            duration = _get_duration_pyav(video_path)
+            logger.info(f"Video duration: {duration:.2f} seconds")
+            return duration
+        except Exception as e:
+            logger.warning(f"Failed to get video duration with PyAV: {e}")
+    
     try:
         cmd = [
             'ffprobe', '-v', 'quiet', '-print_format', 'json',
@@ -27,8 +67,7 @@ def get_video_duration(video_path: str) -> float:
         ]
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         
-        import json
-        data = json.loads(result.stdout)
+        data = json_loads(result.stdout)
         duration = float(data['format']['duration'])
         logger.info(f"Video duration: {duration:.2f} seconds")
         return duration
@@ -52,66 +91,77 @@ def get_video_duration(video_path: str) -> float:
         return 0.0
 
 
+def split_jpeg_stream(data: bytes) -> List[bytes]:
+    """
+    Split concatenated JPEG images (ffmpeg image2pipe output) into single images.
+    
+    Args:
+        data: Concatenated JPEG bytes
+        
+    Returns:
+        List of JPEG images
+    """
+    images = []
+    start = data.find(JPEG_SOI)
+    while start != -1:
+        # An image ends at an EOI marker followed by the next SOI (or end of stream)
+        end = data.find(JPEG_EOI, start + 2)
+        while end != -1 and not (end + 2 == len(data) or data.startswith(JPEG_SOI, end + 2)):
+            end = data.find(JPEG_EOI, end + 2)
+        if end == -1:
+            break
+        images.append(data[start:end + 2])
+        start = data.find(JPEG_SOI, end + 2)
+    return images
+
+
 async def extract_frames_ffmpeg(
     video_path: str,
-    output_dir: str,
     interval_seconds: float,
     max_frames: int
-) -> List[str]:
+) -> List[bytes]:
     """
-    Extract frames using ffmpeg.
+    Extract frames using ffmpeg, streaming JPEG images over a pipe.
     
     Args:
         video_path: Path to input video
-        output_dir: Directory to save frames
         interval_seconds: Interval between frames in seconds
         max_frames: Maximum number of frames to extract
         
     Returns:
-        List of frame file paths
+        List of JPEG-encoded frames
     """
     logger.info(f"Extracting frames with ffmpeg: interval={interval_seconds}s, max={max_frames}")
     
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
     def _extract():
         """Blocking frame extraction function."""
         try:
-            # Build ffmpeg command
-            output_pattern = os.path.join(output_dir, "frame_%04d.jpg")
+            # Build ffmpeg command (JPEG frames are written to stdout, not disk)
             cmd = [
                 'ffmpeg', '-i', video_path,
-                '-vf', f'fps=1/{interval_seconds}',
-                '-q:v', '2',  # High quality JPEG
+                '-vf', f"fps=1/{interval_seconds},scale=-2:'min({FRAME_MAX_HEIGHT},ih)'",
+                '-q:v', str(FFMPEG_JPEG_QSCALE),
                 '-frames:v', str(max_frames),
-                '-y',  # Overwrite output files
-                output_pattern
+                '-f', 'image2pipe',
+                '-c:v', 'mjpeg',
+                'pipe:1'
             ]
             
             # Run ffmpeg
             result = subprocess.run(
                 cmd, 
                 capture_output=True, 
-                text=True, 
                 check=True
             )
             
-            # Collect extracted frame paths
-            frame_paths = []
-            for i in range(1, max_frames + 1):
-                frame_path = os.path.join(output_dir, f"frame_{i:04d}.jpg")
-                if os.path.exists(frame_path):
-                    frame_paths.append(frame_path)
-                else:
-                    break
-            
-            logger.info(f"Extracted {len(frame_paths)} frames with ffmpeg")
-            return frame_paths
+            frames = split_jpeg_stream(result.stdout)
+            logger.info(f"Extracted {len(frames)} frames with ffmpeg")
+            return frames
             
         except subprocess.CalledProcessError as e:
-            logger.error(f"ffmpeg failed: {e.stderr}")
-            raise Exception(f"Frame extraction failed: {e.stderr}")
+            stderr = e.stderr.decode('utf-8', errors='replace')
+            logger.error(f"ffmpeg failed: {stderr}")
+            raise Exception(f"Frame extraction failed: {stderr}")
         except Exception as e:
             logger.error(f"Frame extraction error: {e}")
             raise
@@ -121,95 +171,155 @@ async def extract_frames_ffmpeg(
     return await loop.run_in_executor(None, _extract)
 
 
+def _encode_frame(frame, index: int) -> bytes:
+    """Downscale a decoded frame if it is too tall and encode it as JPEG."""
+    height, width = frame.shape[:2]
+    if height > FRAME_MAX_HEIGHT:
+        scaled_width = int(width * FRAME_MAX_HEIGHT / height)
+        frame = cv2.resize(frame, (scaled_width, FRAME_MAX_HEIGHT), interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, OPENCV_JPEG_QUALITY])
+    if not ok:
+        raise Exception(f"Failed to encode frame {index + 1}")
+    return buffer.tobytes()
+
+
+def _open_capture(video_path: str) -> cv2.VideoCapture:
+    """Open a video file with OpenCV."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise Exception(f"Cannot open video file: {video_path}")
+    return cap
+
+
+def _extract_range_opencv(
+    video_path: str,
+    interval_seconds: float,
+    start: int,
+    stop: int
+) -> Optional[List[bytes]]:
+    """
+    Seek to and encode the sample frames with indices [start, stop).
+    
+    Each call opens its own capture, so ranges can be decoded in parallel.
+    Stops early at the end of the video.
+    
+    Returns:
+        List of JPEG-encoded frames, or None if the video is not seekable
+    """
+    cap = _open_capture(video_path)
+    try:
+        if not cap.set(cv2.CAP_PROP_POS_MSEC, start * interval_seconds * 1000):
+            return None
+        
+        frames = []
+        for index in range(start, stop):
+            if index > start:
+                cap.set(cv2.CAP_PROP_POS_MSEC, index * interval_seconds * 1000)
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(_encode_frame(frame, index))
+        return frames
+    finally:
+        cap.release()
+
+
+def _extract_sequential_opencv(video_path: str, interval_seconds: float, max_frames: int) -> List[bytes]:
+    """Read the video front to back, encoding every sampled frame (for non-seekable videos)."""
+    cap = _open_capture(video_path)
+    try:
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if fps <= 0:
+            fps = 30  # Default fallback
+        
+        frame_interval = max(1, int(fps * interval_seconds))
+        frames = []
+        for index in range(max_frames):
+            # grab() skips decoding the pixel data of unsampled frames
+            if not all(cap.grab() for _ in range(frame_interval if index else 1)):
+                break
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            frames.append(_encode_frame(frame, index))
+        return frames
+    finally:
+        cap.release()
+
+
 async def extract_frames_opencv(
     video_path: str,
-    output_dir: str,
     interval_seconds: float,
     max_frames: int
-) -> List[str]:
+) -> List[bytes]:
     """
-    Extract frames using OpenCV (fallback method).
+    Extract frames using OpenCV (fallback method), encoding JPEGs in memory.
+    
+    Sample times are split into contiguous ranges that are decoded in
+    parallel on the executor, each worker seeking with its own capture.
     
     Args:
         video_path: Path to input video
-        output_dir: Directory to save frames
         interval_seconds: Interval between frames in seconds
         max_frames: Maximum number of frames to extract
         
     Returns:
-        List of frame file paths
+        List of JPEG-encoded frames
     """
     logger.info(f"Extracting frames with OpenCV: interval={interval_seconds}s, max={max_frames}")
     
-    # Ensure output directory exists
-    os.makedirs(output_dir, exist_ok=True)
-    
-    def _extract():
-        """Blocking frame extraction function."""
-        try:
-            cap = cv2.VideoCapture(video_path)
-            if not cap.isOpened():
-                raise Exception(f"Cannot open video file: {video_path}")
-            
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            if fps <= 0:
-                fps = 30  # Default fallback
-            
-            frame_interval = int(fps * interval_seconds)
-            frame_paths = []
-            frame_count = 0
-            extracted_count = 0
-            
-            while extracted_count < max_frames:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                # Extract frame at interval
-                if frame_count % frame_interval == 0:
-                    frame_filename = f"frame_{extracted_count + 1:04d}.jpg"
-                    frame_path = os.path.join(output_dir, frame_filename)
-                    
-                    # Save frame
-                    cv2.imwrite(frame_path, frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
-                    frame_paths.append(frame_path)
-                    extracted_count += 1
-                
-                frame_count += 1
-            
-            cap.release()
-            logger.info(f"Extracted {len(frame_paths)} frames with OpenCV")
-            return frame_paths
-            
-        except Exception as e:
-            logger.error(f"OpenCV frame extraction error: {e}")
-            raise
-    
-    # Run in executor
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, _extract)
+    try:
+        per_worker = -(-max_frames // max(1, min(settings.MAX_WORKERS, max_frames)))
+        ranges = [(start, min(start + per_worker, max_frames)) for start in range(0, max_frames, per_worker)]
+        chunks = await asyncio.gather(*(
+            loop.run_in_executor(None, _extract_range_opencv, video_path, interval_seconds, start, stop)
+            for start, stop in ranges
+        ))
+        
+        if any(chunk is None for chunk in chunks):
+            # Seeking is not supported: read the stream sequentially instead
+            frames = await loop.run_in_executor(
+                None, _extract_sequential_opencv, video_path, interval_seconds, max_frames
+            )
+        else:
+            # Keep frames contiguous: a short range means the video ended there
+            frames = []
+            for chunk, (start, stop) in zip(chunks, ranges):
+                frames.extend(chunk)
+                if len(chunk) < stop - start:
+                    break
+        
+        logger.info(f"Extracted {len(frames)} frames with OpenCV")
+        return frames
+        
+    except Exception as e:
+        logger.error(f"OpenCV frame extraction error: {e}")
+        raise
 
 
 async def extract_frames(
     video_path: str,
-    output_dir: str,
     interval_seconds: float,
-    max_frames: int
-) -> List[str]:
+    max_frames: int,
+    duration: Optional[float] = None
+) -> List[bytes]:
     """
     Extract frames from video using ffmpeg (preferred) or OpenCV (fallback).
     
     Args:
         video_path: Path to input video
-        output_dir: Directory to save frames
         interval_seconds: Interval between frames in seconds
         max_frames: Maximum number of frames to extract
+        duration: Video duration in seconds, if already known
         
     Returns:
-        List of frame file paths
+        List of JPEG-encoded frames
     """
     # Validate video duration
-    duration = get_video_duration(video_path)
+    if duration is None:
+        loop = asyncio.get_running_loop()
+        duration = await loop.run_in_executor(None, get_video_duration, video_path)
     if duration > settings.MAX_VIDEO_DURATION_SECONDS:
         raise ValueError(f"Video too long: {duration:.1f}s > {settings.MAX_VIDEO_DURATION_SECONDS}s")
     
@@ -221,12 +331,12 @@ async def extract_frames(
     
     try:
         # Try ffmpeg first
-        return await extract_frames_ffmpeg(video_path, output_dir, interval_seconds, actual_max_frames)
+        return await extract_frames_ffmpeg(video_path, interval_seconds, actual_max_frames)
     except Exception as ffmpeg_error:
         logger.warning(f"ffmpeg extraction failed, trying OpenCV: {ffmpeg_error}")
         try:
             # Fallback to OpenCV
-            return await extract_frames_opencv(video_path, output_dir, interval_seconds, actual_max_frames)
+            return await extract_frames_opencv(video_path, interval_seconds, actual_max_frames)
         except Exception as opencv_error:
             logger.error(f"Both ffmpeg and OpenCV extraction failed: {opencv_error}")
             raise Exception(f"Frame extraction failed: ffmpeg error: {ffmpeg_error}, opencv error: {opencv_error}")
@@ -236,23 +346,24 @@ def cleanup_frames(frame_paths: List[str]) -> None:
     """Clean up extracted frame files."""
     for frame_path in frame_paths:
         try:
-            if os.path.exists(frame_path):
-                os.remove(frame_path)
+            os.unlink(frame_path)
+        except FileNotFoundError:
+            pass
         except Exception as e:
             logger.warning(f"Failed to cleanup frame {frame_path}: {e}")
     
     logger.info(f"Cleaned up {len(frame_paths)} frame files")
 
 
-def get_frame_timestamps(frame_paths: List[str], interval_seconds: float) -> List[float]:
+def get_frame_timestamps(frames: List[bytes], interval_seconds: float) -> List[float]:
     """
     Calculate timestamps for extracted frames.
     
     Args:
-        frame_paths: List of frame file paths
+        frames: List of extracted frames
         interval_seconds: Interval between frames
         
     Returns:
         List of timestamps in seconds
     """
-    return [i * interval_seconds for i in range(len(frame_paths))]
+    return [i * interval_seconds for i in range(len(frames))]
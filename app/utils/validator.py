@@ -2,12 +2,154 @@
 Data validation and cleanup utilities for video analysis.
 """
 import logging
-from typing import Dict, Any, List
+from itertools import repeat
+from typing import Dict, Any, List, Optional, TypedDict
 
 logger = logging.getLogger(__name__)
 
 
-def validate_and_clean_scenes(structured_data: Dict[str, Any], video_duration: float) -> Dict[str, Any]:
+class PhysicsObjectDict(TypedDict):
+    """Cleaned physics object."""
+    name: str
+    approx_velocity_m_s: Optional[float]
+    direction: Optional[str]
+    collisions: bool
+    notes: Optional[str]
+
+
+class PhysicsDict(TypedDict):
+    """Cleaned scene physics."""
+    objects: List[PhysicsObjectDict]
+    notes: Optional[str]
+
+
+class SceneDict(TypedDict):
+    """Cleaned scene (extra keys from the LLM are passed through)."""
+    start_time: float
+    end_time: float
+    summary: str
+    physics: PhysicsDict
+
+
+class ScenesDict(TypedDict):
+    """Cleaned structured analysis."""
+    scenes: List[SceneDict]
+
+
+# Keys of a cleaned physics object
+_PHYSICS_OBJECT_KEYS = frozenset(PhysicsObjectDict.__annotations__)
+
+
+def _is_clean_scene(scene: Any, video_duration: float) -> bool:
+    """
+    Check whether the fix-up loop would leave a scene unchanged.
+    
+    Args:
+        scene: Scene from the LLM response
+        video_duration: Duration of the video in seconds
+        
+    Returns:
+        True if the scene is already well-formed and within the video
+    """
+    if not validate_scene_structure(scene) or not scene['summary'] or 'notes' not in scene['physics']:
+        return False
+    
+    try:
+        start_time = scene['start_time']
+        end_time = scene['end_time']
+        if not (0.0 <= start_time <= video_duration and start_time + 0.1 <= end_time <= video_duration):
+            return False
+    except TypeError:
+        return False
+    
+    return all(
+        type(obj) is dict and obj.keys() == _PHYSICS_OBJECT_KEYS and type(obj['collisions']) is bool
+        for obj in scene['physics']['objects']
+    )
+
+
+def _clean_scene(i: int, scene: Any, video_duration: float) -> Optional[SceneDict]:
+    """
+    Fill in defaults, clamp times and clean physics objects of one scene in place.
+    
+    Args:
+        i: Index of the scene in the LLM response
+        scene: Raw scene from the LLM response
+        video_duration: Duration of the video in seconds
+        
+    Returns:
+        Cleaned scene, or None if the scene cannot be repaired
+    """
+    # Ensure required fields exist
+    if not isinstance(scene, dict):
+        logger.warning("Scene %d is not a dict, skipping", i)
+        return None
+    
+    start_time = scene.get('start_time')
+    end_time = scene.get('end_time')
+    if not (start_time is None or isinstance(start_time, (int, float))) or \
+            not (end_time is None or isinstance(end_time, (int, float))):
+        logger.error("Scene %d has non-numeric times, skipping", i)
+        return None
+    
+    # Fix missing or invalid start_time
+    if start_time is None:
+        start_time = i * 2.0  # Default based on scene index
+        logger.warning("Scene %d missing start_time, using default: %s", i, start_time)
+    
+    # Fix missing or invalid end_time
+    if end_time is None:
+        # Use start_time + 2 seconds or video duration, whichever is smaller
+        end_time = min(start_time + 2.0, video_duration)
+        logger.warning("Scene %d missing end_time, using default: %s", i, end_time)
+    
+    # Ensure end_time is after start_time
+    if end_time <= start_time:
+        end_time = start_time + 1.0
+        logger.warning("Scene %d end_time <= start_time, adjusting end_time to %s", i, end_time)
+    
+    # Ensure times are within video duration: start in [0, duration] and
+    # end in [start + 0.1, duration] (the lower bound wins); the negated
+    # comparisons also send NaN to the bound, as max()/min() did
+    if video_duration < start_time:
+        start_time = video_duration
+    if not start_time > 0.0:
+        start_time = 0.0
+    if video_duration < end_time:
+        end_time = video_duration
+    if not end_time > start_time + 0.1:
+        end_time = start_time + 0.1
+    scene['start_time'] = start_time
+    scene['end_time'] = end_time
+    
+    # Ensure summary exists
+    if not scene.get('summary'):
+        scene['summary'] = f"Scene {i+1} from {start_time:.1f}s to {end_time:.1f}s"
+        logger.warning("Scene %d missing summary, using default", i)
+    
+    # Ensure physics structure exists
+    physics = scene.get('physics')
+    if not isinstance(physics, dict):
+        scene['physics'] = physics = {"objects": [], "notes": None}
+        logger.warning("Scene %d missing physics structure, using default", i)
+    
+    objects = physics.get('objects', [])
+    if not isinstance(objects, (list, dict, str)):
+        logger.error("Scene %d has non-iterable physics objects, skipping", i)
+        return None
+    
+    physics.setdefault('notes', None)
+    
+    # Clean physics objects
+    physics['objects'] = [
+        clean_physics_object(obj)
+        for obj in objects
+        if isinstance(obj, dict) and 'name' in obj
+    ]
+    return scene
+
+
+def validate_and_clean_scenes(structured_data: Dict[str, Any], video_duration: float) -> ScenesDict:
     """
     Validate and clean the structured scenes data.
     
@@ -29,72 +171,14 @@ def validate_and_clean_scenes(structured_data: Dict[str, Any], video_duration: f
     if len(scenes) == 0:
         raise ValueError("LLM returned empty scenes array")
     
-    cleaned_scenes = []
-    
-    for i, scene in enumerate(scenes):
-        try:
-            # Ensure required fields exist
-            if not isinstance(scene, dict):
-                logger.warning(f"Scene {i} is not a dict, skipping")
-                continue
-            
-            # Fix missing or invalid start_time
-            if 'start_time' not in scene or scene['start_time'] is None:
-                scene['start_time'] = i * 2.0  # Default based on scene index
-                logger.warning(f"Scene {i} missing start_time, using default: {scene['start_time']}")
-            
-            # Fix missing or invalid end_time
-            if 'end_time' not in scene or scene['end_time'] is None:
-                # Use start_time + 2 seconds or video duration, whichever is smaller
-                scene['end_time'] = min(scene['start_time'] + 2.0, video_duration)
-                logger.warning(f"Scene {i} missing end_time, using default: {scene['end_time']}")
-            
-            # Ensure end_time is after start_time
-            if scene['end_time'] <= scene['start_time']:
-                scene['end_time'] = scene['start_time'] + 1.0
-                logger.warning(f"Scene {i} end_time <= start_time, adjusting end_time to {scene['end_time']}")
-            
-            # Ensure times are within video duration
-            scene['start_time'] = max(0.0, min(scene['start_time'], video_duration))
-            scene['end_time'] = max(scene['start_time'] + 0.1, min(scene['end_time'], video_duration))
-            
-            # Ensure summary exists
-            if 'summary' not in scene or not scene['summary']:
-                scene['summary'] = f"Scene {i+1} from {scene['start_time']:.1f}s to {scene['end_time']:.1f}s"
-                logger.warning(f"Scene {i} missing summary, using default")
-            
-            # Ensure physics structure exists
-            if 'physics' not in scene or not isinstance(scene['physics'], dict):
-                scene['physics'] = {"objects": [], "notes": None}
-                logger.warning(f"Scene {i} missing physics structure, using default")
-            
-            if 'objects' not in scene['physics']:
-                scene['physics']['objects'] = []
-            
-            if 'notes' not in scene['physics']:
-                scene['physics']['notes'] = None
-            
-            # Clean physics objects
-            cleaned_objects = []
-            for obj in scene['physics'].get('objects', []):
-                if isinstance(obj, dict) and 'name' in obj:
-                    # Ensure all required fields exist with defaults
-                    cleaned_obj = {
-                        'name': obj.get('name', 'Unknown object'),
-                        'approx_velocity_m_s': obj.get('approx_velocity_m_s'),
-                        'direction': obj.get('direction'),
-                        'collisions': bool(obj.get('collisions', False)),
-                        'notes': obj.get('notes')
-                    }
-                    cleaned_objects.append(cleaned_obj)
-            
-            scene['physics']['objects'] = cleaned_objects
-            cleaned_scenes.append(scene)
-            
-        except Exception as e:
-            logger.error(f"Error cleaning scene {i}: {e}")
-            # Skip problematic scenes rather than failing completely
-            continue
+    # Well-formed responses (the common case) need no fix-up at all
+    if all(_is_clean_scene(scene, video_duration) for scene in scenes):
+        return structured_data
+    
+    # Unrepairable scenes come back as None and are dropped
+    cleaned_scenes: List[SceneDict] = list(filter(None, map(
+        _clean_scene, range(len(scenes)), scenes, repeat(video_duration)
+    )))
     
     if len(cleaned_scenes) == 0:
         raise ValueError("No valid scenes after cleaning")
@@ -132,10 +216,13 @@ def validate_scene_structure(scene: Dict[str, Any]) -> bool:
     return True
 
 
-def clean_physics_object(obj: Dict[str, Any]) -> Dict[str, Any]:
+def clean_physics_object(obj: Dict[str, Any]) -> PhysicsObjectDict:
     """
     Clean and validate a physics object.
     
+    collisions is coerced with bool(), since LLM output is not guaranteed
+    to use JSON booleans (1, "yes" and the like count as a collision).
+    
     Args:
         obj: Raw physics object dictionary
         